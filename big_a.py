@@ -3,7 +3,7 @@ import pandas as pd, numpy as np, datetime as dt
 import matplotlib.pyplot as plt
 import plotly.graph_objects as go, plotly.io as pio
 import akshare as ak
-import re
+import re, json
 
 def _parse_zh_month_any(s: str) -> pd.Timestamp:
     """
@@ -334,6 +334,10 @@ h1{font-size:22px;margin:0} .desc{color:var(--muted);margin:6px 0 0;font-size:13
 table{width:100%;border-collapse:collapse;font-size:13px;min-width:520px}
 th,td{padding:10px 12px;border-bottom:1px solid var(--grid);white-space:nowrap}
 th{text-align:left;color:var(--muted);background:rgba(0,0,0,0.04)}
+.rangebar{display:flex;align-items:center;gap:6px;flex-wrap:wrap}
+.rangebar button{font-size:12px;padding:4px 10px;border:1px solid var(--grid);border-radius:8px;background:var(--card);color:var(--text);cursor:pointer}
+.rangebar button.on{background:rgba(27,115,232,0.2)}
+#range-start{color:var(--muted);font-size:12px;margin-left:8px}
 .footer{color:var(--muted);font-size:12px;margin-top:12px;line-height:1.6}
 @media (max-width: 960px){
   .container{padding:0 12px; max-width: 100%}
@@ -352,6 +356,70 @@ snap = pd.concat([latest_raw, latest_macro])
 order = list(equity_df_raw.columns) + macro_cols
 snap = snap.reindex(order)
 
+# ===== 区间统计预计算：每个指数 × 每个区间，一次算好嵌入页面 =====
+RANGES = [
+    ("6月", pd.DateOffset(months=6)),
+    ("1年", pd.DateOffset(years=1)),
+    ("3年", pd.DateOffset(years=3)),
+    ("5年", pd.DateOffset(years=5)),
+    ("10年", None),                  # 全样本，对应图上 step="all"
+]
+DEFAULT_RANGE = "5年"                # 与图表初始窗口一致
+PERIODS_PER_YEAR = {"D": 252, "W-FRI": 52, "ME": 12}.get(FREQ, 252)
+
+def _r(v, nd=4):
+    return None if pd.isnull(v) else round(float(v), nd)
+
+def _since(d, t0):
+    return None if d is None or pd.isnull(d) or d <= t0 else str(d.date())
+
+def precompute_range_stats(px: pd.DataFrame, macro: pd.DataFrame) -> dict:
+    """
+    每个区间内按列向量化计算（不逐个指数循环）：
+    - 指数：区间涨跌、年化波动（逐期收益std × sqrt(PERIODS_PER_YEAR)）、最大回撤
+    - 宏观：区间末值 - 区间首值（百分点）
+    某列在区间首个观测日缺值（上市晚/抓取缺口）时，该列从自身首个有效点起算，
+    并在行尾记下该日期（否则为 None）。
+    返回 {区间: {"from": 截断日, "months": 回看月数, "start": 首个观测日,
+                 "rows": [[涨跌, 波动, 回撤, 起算日] / [变化, 起算日], ...]}}，
+    rows 顺序与 order 一致；"from"/"months" 用于与图上 rangeselector 的 range 联动
+    """
+    rets = px.pct_change(fill_method=None)
+    out = {}
+    for label, offset in RANGES:
+        start = px.index[0] if offset is None else END_TS - offset
+        w = px.loc[start:]
+        if w.empty:
+            continue
+        t0 = w.index[0]
+        since = w.apply(pd.Series.first_valid_index)
+        first, last = w.bfill().iloc[0], w.ffill().iloc[-1]
+        ret = last / first - 1
+        vol = rets.loc[start:].iloc[1:].std() * np.sqrt(PERIODS_PER_YEAR)
+        mdd = (w / w.cummax() - 1).min()
+        rows = [[_r(ret[c]), _r(vol[c]), _r(mdd[c]), _since(since[c], t0)] for c in px.columns]
+
+        if not macro.empty:
+            m = macro.loc[start:]
+            chg = m.ffill().iloc[-1] - m.bfill().iloc[0]
+            m_since = m.apply(pd.Series.first_valid_index)
+            rows += [[_r(chg[c]), _since(m_since[c], t0)] for c in macro.columns]
+        months = None if offset is None else offset.kwds.get("years", 0) * 12 + offset.kwds.get("months", 0)
+        out[label] = {"from": str(pd.Timestamp(start).date()), "months": months,
+                      "start": str(t0.date()), "rows": rows}
+    return out
+
+RANGE_STATS = precompute_range_stats(equity_df_raw, df_all[macro_cols])
+
+def fmt_stat(v, unit="%", signed=True):
+    if v is None:
+        return ""
+    sign = "+" if signed else ""
+    return f"{v * 100:{sign}.2f}%" if unit == "%" else f"{v:{sign}.2f}pp"
+
+def since_txt(d):
+    return f"（自{d}）" if d else ""
+
 def fmt_val(name, v):
     if pd.isnull(v):
         return ""
@@ -361,15 +429,84 @@ def fmt_val(name, v):
     else:
         return f"{v:.2f}%"
 
-rows_html = "".join(f"<tr><td>{k}</td><td>{fmt_val(k, v)}</td></tr>" for k, v in snap.items())
+def stat_cells(i, name):
+    row = RANGE_STATS.get(DEFAULT_RANGE, {}).get("rows", [])
+    vals = row[i] if i < len(row) else []
+    if name in equity_df_raw.columns:
+        texts = [fmt_stat(v, signed=(j != 1)) for j, v in enumerate(vals[:3])] or ["", "", ""]
+        if vals:
+            texts[0] += since_txt(vals[3])
+    else:
+        texts = [fmt_stat(vals[0], "pp") + since_txt(vals[1]) if vals else "", "", ""]
+    return "".join(f"<td data-r='{i}' data-c='{j}'>{t}</td>" for j, t in enumerate(texts))
+
+rows_html = "".join(
+    f"<tr><td>{k}</td><td>{fmt_val(k, v)}</td>{stat_cells(i, k)}</tr>"
+    for i, (k, v) in enumerate(snap.items())
+)
+RANGE_BTNS = "".join(
+    f"<button data-range='{label}' class='{'on' if label == DEFAULT_RANGE else ''}'>{label}</button>"
+    for label, _ in RANGES if label in RANGE_STATS
+)
 TABLE_HTML = f"""
+<div class='rangebar'>{RANGE_BTNS}<span id='range-start'>起：{RANGE_STATS.get(DEFAULT_RANGE, {}).get('start', '')}</span></div>
 <div class='tablewrap'>
   <table>
-    <thead><tr><th>系列</th><th>最新值</th></tr></thead>
+    <thead><tr><th>系列</th><th>最新值</th><th>区间涨跌/变化</th><th>年化波动</th><th>最大回撤</th></tr></thead>
     <tbody>{rows_html}</tbody>
   </table>
 </div>
 """
+
+# 区间切换：查预计算表改单元格，并与图表时间窗双向同步（图上按钮也会切换表格）
+STATS_JSON = json.dumps(
+    {"nEq": len(equity_df_raw.columns), "end": str(END_TS.date()), "ranges": RANGE_STATS},
+    ensure_ascii=False, separators=(",", ":"),
+)
+SCRIPT = f"""
+<script>
+(function(){{
+  const S = {STATS_JSON};
+  const fmt = (v, pp, signed) => v === null || v === undefined ? "" :
+    (signed && v >= 0 ? "+" : "") + (pp ? v.toFixed(2) + "pp" : (v * 100).toFixed(2) + "%");
+  const gd = () => document.querySelector(".card .js-plotly-plot");
+  function setRange(label, moveChart) {{
+    const R = S.ranges[label];
+    if (!R) return;
+    document.querySelectorAll("td[data-r]").forEach(td => {{
+      const i = +td.dataset.r, j = +td.dataset.c, row = R.rows[i] || [];
+      const since = d => d ? "（自" + d + "）" : "";
+      if (i < S.nEq) td.textContent = fmt(row[j], false, j !== 1) + (j === 0 ? since(row[3]) : "");
+      else td.textContent = j === 0 ? fmt(row[0], true, true) + since(row[1]) : "";
+    }});
+    document.querySelectorAll(".rangebar button").forEach(b => b.classList.toggle("on", b.dataset.range === label));
+    document.getElementById("range-start").textContent = "起：" + R.start;
+    if (moveChart && gd()) {{
+      Plotly.relayout(gd(), label === "10年" ? {{"xaxis.autorange": true}} : {{"xaxis.range": [R.from, S.end]}});
+    }}
+  }}
+  document.querySelectorAll(".rangebar button").forEach(b => b.addEventListener("click", () => setRange(b.dataset.range, true)));
+  window.addEventListener("load", () => {{
+    const g = gd();
+    if (!g || !g.on) return;
+    g.on("plotly_relayout", ev => {{
+      if (ev["xaxis.autorange"]) return setRange("10年", false);
+      const r0 = ev["xaxis.range[0]"] || (ev["xaxis.range"] || [])[0];
+      const r1 = ev["xaxis.range[1]"] || (ev["xaxis.range"] || [])[1];
+      if (!r0) return;
+      const day = s => Date.parse(String(s).slice(0, 10));
+      const t0 = day(r0);
+      // rangeselector 从当前窗口右端回看 N 个月；右端不一定是 S.end（如先点过"10年"）
+      const back = m => {{ const d = new Date(day(r1)); d.setUTCMonth(d.getUTCMonth() - m); return d.getTime(); }};
+      for (const [label, R] of Object.entries(S.ranges)) {{
+        if (!R.months) continue;
+        if (Math.abs(day(R.from) - t0) <= 864e5 || (r1 && Math.abs(back(R.months) - t0) <= 864e5)) return setRange(label, false);
+      }}
+    }});
+  }});
+}})();
+</script>
+"""
 AS_OF_TXT = f"（数据截止：{END_TS.date()}）"
 INTRO = f"""
 <div class="container">
@@ -384,10 +521,10 @@ INTRO = f"""
     </div>
   </div>
   <div class="card"><!-- PLOTLY_CHART --></div>
-  <h3 style="margin:14px 0 8px;font-size:15px;">数据快照（真实点位）</h3>
+  <h3 style="margin:14px 0 8px;font-size:15px;">数据快照（真实点位 + 区间统计）</h3>
   {TABLE_HTML}
   <div class="footer">
-    频率：<b>{FREQ}</b>；股指曲线为归一化展示（便于对比），上表显示真实指数点位；宏观为同比（%），已上采样并前向填充对齐到所选频率。
+    频率：<b>{FREQ}</b>；股指曲线为归一化展示（便于对比），上表显示真实指数点位；区间涨跌/年化波动/最大回撤基于真实点位预计算，宏观列为区间首末同比之差（pp）；宏观为同比（%），已上采样并前向填充对齐到所选频率。
   </div>
 </div>
 """
@@ -399,6 +536,7 @@ HTML = f"""<!doctype html>
 <title>{TITLE}</title>
 {CSS}
 <body>{INTRO.replace("<!-- PLOTLY_CHART -->", plot_html)}
+{SCRIPT}
 </body></html>"""
 
 with open(OUT_HTML, "w", encoding="utf-8") as f: